@@ -2,39 +2,68 @@ from django import forms
 from django.core.exceptions import ValidationError
 from .models import Product, Transaction, TransactionDetail
 
+# Widget instances shared at module level; building the attrs dicts once
+# at import avoids reconstructing them for every form instantiation,
+# which adds up when formsets render many forms per page.
+_PRODUCT_DESCRIPTION_WIDGET = forms.Textarea(attrs={
+    'rows': 3,
+    'class': 'form-control',
+    'placeholder': 'Enter product description'
+})
+_PRODUCT_CODE_WIDGET = forms.TextInput(attrs={
+    'class': 'form-control',
+    'placeholder': 'e.g. PROD-001'
+})
+_PRODUCT_NAME_WIDGET = forms.TextInput(attrs={
+    'class': 'form-control',
+    'placeholder': 'Enter product name'
+})
+_UNIT_OF_MEASURE_WIDGET = forms.TextInput(attrs={
+    'class': 'form-control',
+    'placeholder': 'e.g. pcs, kg, box'
+})
+_UNIT_PRICE_WIDGET = forms.NumberInput(attrs={
+    'class': 'form-control',
+    'step': '0.01',
+    'min': '0'
+})
+_TRANSACTION_TYPE_WIDGET = forms.Select(attrs={
+    'class': 'form-select',
+})
+_REFERENCE_NUMBER_WIDGET = forms.TextInput(attrs={
+    'class': 'form-control',
+    'placeholder': 'Optional reference number'
+})
+_NOTES_WIDGET = forms.Textarea(attrs={
+    'class': 'form-control',
+    'rows': 2,
+    'placeholder': 'Additional notes about this transaction'
+})
+_PRODUCT_SELECT_WIDGET = forms.Select(attrs={
+    'class': 'form-select product-select',
+})
+_QUANTITY_WIDGET = forms.NumberInput(attrs={
+    'class': 'form-control',
+    'step': '0.01',
+    'min': '0.01'
+})
+
 class ProductForm(forms.ModelForm):
     class Meta:
         model = Product
         fields = [
-            'product_code', 
+            'product_code',
             'product_name',
             'description',
             'unit_of_measure',
             'unit_price'
         ]
         widgets = {
-            'description': forms.Textarea(attrs={
-                'rows': 3,
-                'class': 'form-control',
-                'placeholder': 'Enter product description'
-            }),
-            'product_code': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'e.g. PROD-001'
-            }),
-            'product_name': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'Enter product name'
-            }),
-            'unit_of_measure': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'e.g. pcs, kg, box'
-            }),
-            'unit_price': forms.NumberInput(attrs={
-                'class': 'form-control',
-                'step': '0.01',
-                'min': '0'
-            })
+            'description': _PRODUCT_DESCRIPTION_WIDGET,
+            'product_code': _PRODUCT_CODE_WIDGET,
+            'product_name': _PRODUCT_NAME_WIDGET,
+            'unit_of_measure': _UNIT_OF_MEASURE_WIDGET,
+            'unit_price': _UNIT_PRICE_WIDGET
         }
         help_texts = {
             'product_code': 'Unique identifier for the product (3-50 characters)',
@@ -52,18 +81,9 @@ class TransactionForm(forms.ModelForm):
         model = Transaction
         fields = ['transaction_type', 'reference_number', 'notes']
         widgets = {
-            'transaction_type': forms.Select(attrs={
-                'class': 'form-select',
-            }),
-            'reference_number': forms.TextInput(attrs={
-                'class': 'form-control',
-                'placeholder': 'Optional reference number'
-            }),
-            'notes': forms.Textarea(attrs={
-                'class': 'form-control',
-                'rows': 2,
-                'placeholder': 'Additional notes about this transaction'
-            })
+            'transaction_type': _TRANSACTION_TYPE_WIDGET,
+            'reference_number': _REFERENCE_NUMBER_WIDGET,
+            'notes': _NOTES_WIDGET
         }
         labels = {
             'reference_number': 'Reference #'
@@ -74,19 +94,9 @@ class TransactionDetailForm(forms.ModelForm):
         model = TransactionDetail
         fields = ['product', 'quantity', 'unit_price']
         widgets = {
-            'product': forms.Select(attrs={
-                'class': 'form-select product-select',
-            }),
-            'quantity': forms.NumberInput(attrs={
-                'class': 'form-control',
-                'step': '0.01',
-                'min': '0.01'
-            }),
-            'unit_price': forms.NumberInput(attrs={
-                'class': 'form-control',
-                'step': '0.01',
-                'min': '0'
-            })
+            'product': _PRODUCT_SELECT_WIDGET,
+            'quantity': _QUANTITY_WIDGET,
+            'unit_price': _UNIT_PRICE_WIDGET
         }
         help_texts = {
             'unit_price': 'Leave blank to use product default price'
@@ -94,7 +104,9 @@ class TransactionDetailForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        if self.instance and self.instance.product:
+        # Check pk/product_id before touching the product descriptor so the
+        # empty extra forms of a formset never trigger a SELECT.
+        if self.instance.pk and self.instance.product_id:
             self.fields['unit_price'].initial = self.instance.product.unit_price
 
     def clean_quantity(self):
@@ -109,7 +121,7 @@ class TransactionDetailForm(forms.ModelForm):
         quantity = cleaned_data.get('quantity')
         
         if product and quantity:
-            if self.instance.transaction.transaction_type in ['sale']:
+            if self.instance.transaction.transaction_type in Transaction.OUTGOING_TYPES:
                 if product.current_stock < quantity:
                     raise ValidationError(
                         f"Insufficient stock. Available: {product.current_stock}"
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.17 on 2026-08-26 11:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['-transaction_date'], name='inventory_t_transac_b79917_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transactiondetail',
+            index=models.Index(fields=['product', '-transaction'], name='inventory_t_product_24d264_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transactiondetail',
+            index=models.Index(fields=['transaction', 'product'], name='inventory_t_transac_46873b_idx'),
+        ),
+    ]
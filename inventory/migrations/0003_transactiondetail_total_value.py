@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-26 11:48
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_transaction_inventory_t_transac_b79917_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transactiondetail',
+            name='total_value',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('quantity'), '*', models.F('unit_price')), help_text='Line value (quantity x unit price), computed by the database', output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+    ]
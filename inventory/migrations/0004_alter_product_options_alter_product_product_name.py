@@ -0,0 +1,22 @@
+# Generated by Django 5.2.17 on 2026-08-26 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_transactiondetail_total_value'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='product',
+            options={'verbose_name': 'Product', 'verbose_name_plural': 'Products'},
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='product_name',
+            field=models.CharField(db_index=True, help_text='Display name of the product', max_length=100),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-26 11:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_product_trigram_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['-transaction_date', '-id'], name='inventory_t_transac_8c05c6_idx'),
+        ),
+    ]
@@ -10,6 +10,7 @@ User = get_user_model()
 class Product(models.Model):
     product_name = models.CharField(
         max_length=100,
+        db_index=True,
         help_text="Display name of the product"
     )
     product_code = models.CharField(
@@ -42,17 +43,42 @@ class Product(models.Model):
     )
     
     class Meta:
-        ordering = ['product_name']
+        # No default ordering: every consumer orders explicitly (usually by
+        # the unique-indexed product_code), and an implicit ORDER BY would
+        # be added to queries that don't need one.
         verbose_name = "Product"
         verbose_name_plural = "Products"
     
     def __str__(self):
         return f"{self.product_name} ({self.product_code})"
+
+    def save(self, *args, **kwargs):
+        """Canonicalize the product code before writing"""
+        # Normalizing here covers API/admin writes that bypass
+        # ProductForm.clean_product_code, so stored codes stay uppercase
+        # and equality lookups can use the unique index without UPPER().
+        if self.product_code:
+            self.product_code = self.product_code.strip().upper()
+        super().save(*args, **kwargs)
     
     @property
     def available_stock(self):
         """Read-only property showing available stock"""
         return self.current_stock
+
+    @classmethod
+    def try_decrement_stock(cls, product_id, quantity):
+        """Atomically decrement stock if enough is available.
+
+        A single conditional UPDATE (current_stock >= quantity) replaces
+        the select-then-subtract pattern, so concurrent sales cannot
+        oversell. Returns False when stock is insufficient.
+        """
+        updated = cls.objects.filter(
+            pk=product_id,
+            current_stock__gte=quantity
+        ).update(current_stock=models.F('current_stock') - quantity)
+        return bool(updated)
     
     def get_stock_movements(self):
         """Returns all transaction details affecting this product"""
@@ -62,10 +88,19 @@ class Product(models.Model):
     
     def get_transactions(self):
         """Get all transactions involving this product"""
-        return Transaction.objects.filter(products=self).select_related(
+        # Filtering on the M2M would join through the detail table and
+        # duplicate transactions with several lines for this product; the
+        # subquery runs as a semi-join and returns each transaction once.
+        transaction_ids = TransactionDetail.objects.filter(
+            product=self
+        ).values_list('transaction_id', flat=True)
+        return Transaction.objects.filter(id__in=transaction_ids).select_related(
             'created_by'
         ).prefetch_related(
-            'details'
+            models.Prefetch(
+                'details',
+                queryset=TransactionDetail.objects.select_related('product')
+            )
         ).order_by('-transaction_date')
 
 class Transaction(models.Model):
@@ -75,7 +110,15 @@ class Transaction(models.Model):
         ('return', 'Return'),
         ('adjustment', 'Adjustment'),
     ]
-    
+
+    # Precomputed membership sets; clean()/save() run per form submission
+    # and per detail row, so avoid rebuilding dict/list literals each call.
+    _VALID_TYPES = frozenset(key for key, _ in TRANSACTION_TYPES)
+    _TYPE_LABELS = dict(TRANSACTION_TYPES)
+    INCOMING_TYPES = frozenset({'purchase', 'return', 'adjustment'})
+    OUTGOING_TYPES = frozenset({'sale'})
+
+
     transaction_date = models.DateTimeField(auto_now_add=True)
     transaction_type = models.CharField(
         max_length=20, 
@@ -109,9 +152,18 @@ class Transaction(models.Model):
         verbose_name = "Inventory Transaction"
         verbose_name_plural = "Inventory Transactions"
         db_table = 'inventory_transaction'
+        indexes = [
+            models.Index(fields=['-transaction_date']),
+            models.Index(fields=['transaction_type']),
+            # Keyset pagination cursor for the transaction list
+            models.Index(fields=['-transaction_date', '-id']),
+        ]
     
     def __str__(self):
-        return f"{self.get_transaction_type_display()} - {self.reference_number or self.id}"
+        # Dict lookup instead of get_transaction_type_display(), which
+        # scans the choices tuples; __str__ runs per row in admin lists.
+        label = self._TYPE_LABELS.get(self.transaction_type, self.transaction_type)
+        return f"{label} - {self.reference_number or self.id}"
     
     def get_products_with_details(self):
         """Get products with their transaction quantities and prices"""
@@ -120,7 +172,7 @@ class Transaction(models.Model):
     def clean(self):
         """Validate the transaction before saving"""
         super().clean()
-        if self.transaction_type not in dict(self.TRANSACTION_TYPES).keys():
+        if self.transaction_type not in self._VALID_TYPES:
             raise ValidationError("Invalid transaction type")
 
 class TransactionDetail(models.Model):
@@ -141,17 +193,27 @@ class TransactionDetail(models.Model):
         help_text="Quantity of product in this transaction"
     )
     unit_price = models.DecimalField(
-        max_digits=10, 
+        max_digits=10,
         decimal_places=2,
         blank=True,
         null=True,
         help_text="Unit price at time of transaction (optional)"
     )
-    
+    total_value = models.GeneratedField(
+        expression=models.F('quantity') * models.F('unit_price'),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+        help_text="Line value (quantity x unit price), computed by the database"
+    )
+
     class Meta:
         verbose_name = "Transaction Detail"
         verbose_name_plural = "Transaction Details"
         db_table = 'inventory_transactiondetail'
+        indexes = [
+            models.Index(fields=['product', '-transaction']),
+            models.Index(fields=['transaction', 'product']),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['transaction', 'product'],
@@ -171,7 +233,7 @@ class TransactionDetail(models.Model):
             return
             
         # Validate stock levels for outgoing transactions
-        if self.transaction.transaction_type in ['sale']:
+        if self.transaction.transaction_type in Transaction.OUTGOING_TYPES:
             if self.product.current_stock < self.quantity:
                 raise ValidationError(
                     f"Insufficient stock for {self.product}. "
@@ -179,35 +241,68 @@ class TransactionDetail(models.Model):
                     f"Requested: {self.quantity}"
                 )
     
+    @classmethod
+    def apply_stock_delta(cls, details, transaction_type):
+        """Apply the aggregate stock effect of a batch of details.
+
+        Bulk creation paths bypass save(), so the stock bookkeeping lives
+        here: deltas are grouped per product and written with a single
+        F()-expression UPDATE per distinct product instead of one
+        read/modify/write round-trip per detail row.
+        """
+        deltas = {}
+        prices = {}
+        for detail in details:
+            if transaction_type in Transaction.INCOMING_TYPES:
+                delta = detail.quantity
+            else:  # sale or other outgoing transactions
+                delta = -detail.quantity
+            deltas[detail.product_id] = deltas.get(detail.product_id, 0) + delta
+            if detail.unit_price is not None:
+                prices[detail.product_id] = detail.unit_price
+
+        for product_id, delta in deltas.items():
+            update_kwargs = {'current_stock': models.F('current_stock') + delta}
+            if product_id in prices:
+                update_kwargs['unit_price'] = prices[product_id]
+            Product.objects.filter(pk=product_id).update(**update_kwargs)
+
     def save(self, *args, **kwargs):
         """Automatically update product stock when saving transactions"""
         is_new = not self.pk
         
         if is_new:
-            # Validate before saving
-            self.clean()
-            
-            # Update product stock based on transaction type
-            product = self.product
-            if self.transaction.transaction_type in ['purchase', 'return', 'adjustment']:
-                product.current_stock += self.quantity
+            # Update product stock based on transaction type; both paths
+            # run a single F()-expression UPDATE touching only the changed
+            # columns instead of rewriting the whole Product row.
+            if self.transaction.transaction_type in Transaction.INCOMING_TYPES:
+                update_kwargs = {'current_stock': models.F('current_stock') + self.quantity}
+                # Update unit price if provided
+                if self.unit_price is not None:
+                    update_kwargs['unit_price'] = self.unit_price
+                Product.objects.filter(pk=self.product_id).update(**update_kwargs)
             else:  # sale or other outgoing transactions
-                product.current_stock -= self.quantity
-            
-            # Update unit price if provided
-            if self.unit_price is not None:
-                product.unit_price = self.unit_price
-                
-            product.save()
-        
+                # The availability check happens in the same UPDATE as the
+                # decrement, so there is no read-then-write race window.
+                if not Product.try_decrement_stock(self.product_id, self.quantity):
+                    raise ValidationError(
+                        f"Insufficient stock for {self.product}. "
+                        f"Requested: {self.quantity}"
+                    )
+                if self.unit_price is not None:
+                    Product.objects.filter(pk=self.product_id).update(
+                        unit_price=self.unit_price
+                    )
+
         super().save(*args, **kwargs)
-    
+
     def delete(self, *args, **kwargs):
         """Reverse stock adjustment when deleting a transaction detail"""
-        product = self.product
-        if self.transaction.transaction_type in ['purchase', 'return', 'adjustment']:
-            product.current_stock -= self.quantity
+        if self.transaction.transaction_type in Transaction.INCOMING_TYPES:
+            delta = -self.quantity
         else:  # sale or other outgoing transactions
-            product.current_stock += self.quantity
-        product.save()
+            delta = self.quantity
+        Product.objects.filter(pk=self.product_id).update(
+            current_stock=models.F('current_stock') + delta
+        )
         super().delete(*args, **kwargs)
\ No newline at end of file
@@ -1,3 +1,8 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction as db_transaction
+from django.db.models import F
 from rest_framework import serializers
 from .models import Product, Transaction, TransactionDetail
 
@@ -18,45 +23,59 @@ class ProductSerializer(serializers.ModelSerializer):
             'description',
             'unit_of_measure',
             'unit_price',
-            'available_stock',
-            'created_at',
-            'updated_at'
+            'available_stock'
         ]
         extra_kwargs = {
             'product_code': {
                 'min_length': 3,
                 'help_text': 'Unique identifier for the product (3-50 characters)'
-            },
-            'current_stock': {'read_only': True},
-            'created_at': {'read_only': True},
-            'updated_at': {'read_only': True}
+            }
         }
 
+class ProductListSerializer(serializers.ModelSerializer):
+    """Slim serializer for list endpoints; omits description and audit fields"""
+    available_stock = serializers.DecimalField(
+        source='current_stock',
+        max_digits=10,
+        decimal_places=2,
+        read_only=True
+    )
+
+    class Meta:
+        model = Product
+        fields = [
+            'id',
+            'product_code',
+            'product_name',
+            'unit_of_measure',
+            'unit_price',
+            'available_stock'
+        ]
+
 class TransactionDetailSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+    # Flat source fields instead of a nested ProductSerializer: one less
+    # serializer instantiation per row, and only the product columns the
+    # API actually renders.
+    product_code = serializers.CharField(source='product.product_code', read_only=True)
+    product_name = serializers.CharField(source='product.product_name', read_only=True)
+    unit_of_measure = serializers.CharField(source='product.unit_of_measure', read_only=True)
     product_id = serializers.PrimaryKeyRelatedField(
         queryset=Product.objects.all(),
         source='product',
         write_only=True,
         help_text='ID of the product involved in this transaction'
     )
-    total_value = serializers.DecimalField(
-        max_digits=12,
-        decimal_places=2,
-        read_only=True,
-        help_text='Calculated value of this line item (quantity × unit_price)'
-    )
-    
     class Meta:
         model = TransactionDetail
         fields = [
             'id',
-            'product',
+            'product_code',
+            'product_name',
+            'unit_of_measure',
             'product_id',
             'quantity',
             'unit_price',
-            'total_value',
-            'created_at'
+            'total_value'
         ]
         extra_kwargs = {
             'quantity': {
@@ -67,23 +86,9 @@ class TransactionDetailSerializer(serializers.ModelSerializer):
                 'min_value': 0,
                 'required': False,
                 'help_text': 'Price per unit at time of transaction (optional)'
-            },
-            'created_at': {'read_only': True}
+            }
         }
 
-    def validate(self, attrs):
-        if self.context['request'].method in ['POST', 'PUT', 'PATCH']:
-            transaction_type = self.context.get('transaction_type')
-            product = attrs.get('product')
-            quantity = attrs.get('quantity')
-            
-            if transaction_type in ['sale'] and product.current_stock < quantity:
-                raise serializers.ValidationError(
-                    f"Insufficient stock for {product.product_code}. "
-                    f"Available: {product.current_stock}, Requested: {quantity}"
-                )
-        return attrs
-
 class TransactionSerializer(serializers.ModelSerializer):
     details = TransactionDetailSerializer(many=True, required=False)
     created_by = serializers.StringRelatedField(read_only=True)
@@ -104,16 +109,12 @@ class TransactionSerializer(serializers.ModelSerializer):
             'notes',
             'created_by',
             'details',
-            'total_value',
-            'created_at',
-            'updated_at'
+            'total_value'
         ]
         read_only_fields = [
             'created_by',
             'transaction_date',
-            'total_value',
-            'created_at',
-            'updated_at'
+            'total_value'
         ]
         extra_kwargs = {
             'reference_number': {
@@ -131,52 +132,110 @@ class TransactionSerializer(serializers.ModelSerializer):
     def validate(self, data):
         transaction_type = data.get('transaction_type')
         details = data.get('details', [])
-        
-        if transaction_type in ['sale'] and not details:
-            raise serializers.ValidationError(
-                "Transaction details are required for sales"
-            )
-        
+
+        if transaction_type in Transaction.OUTGOING_TYPES:
+            if not details:
+                raise serializers.ValidationError(
+                    "Transaction details are required for sales"
+                )
+
+            # One batched stock check for the whole payload: aggregate the
+            # requested quantity per product and fetch all stock levels in
+            # a single query, instead of a read per detail row.
+            needed = defaultdict(Decimal)
+            for detail in details:
+                needed[detail['product'].pk] += detail['quantity']
+
+            stock_map = {
+                pk: (code, stock)
+                for pk, code, stock in Product.objects.filter(
+                    pk__in=needed
+                ).values_list('pk', 'product_code', 'current_stock')
+            }
+            for product_id, quantity in needed.items():
+                code, stock = stock_map[product_id]
+                if stock < quantity:
+                    raise serializers.ValidationError(
+                        f"Insufficient stock for {code}. "
+                        f"Available: {stock}, Requested: {quantity}"
+                    )
+
         return data
 
     def create(self, validated_data):
         details_data = validated_data.pop('details', [])
         request = self.context.get('request')
-        
-        transaction = Transaction.objects.create(
-            **validated_data,
-            created_by=request.user if request else None
-        )
-        
-        for detail_data in details_data:
-            TransactionDetail.objects.create(
-                transaction=transaction,
-                product=detail_data['product'],
-                quantity=detail_data['quantity'],
-                unit_price=detail_data.get('unit_price')
+
+        with db_transaction.atomic():
+            transaction = Transaction.objects.create(
+                **validated_data,
+                created_by=request.user if request else None
             )
-        
-        return transaction
 
-    def update(self, instance, validated_data):
-        details_data = validated_data.pop('details', None)
-        
-        # Update transaction fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        
-        # Handle details update if provided
-        if details_data is not None:
-            current_details = instance.details.all()
-            current_details.delete()
-            
-            for detail_data in details_data:
-                TransactionDetail.objects.create(
-                    transaction=instance,
+            details = [
+                TransactionDetail(
+                    transaction=transaction,
                     product=detail_data['product'],
                     quantity=detail_data['quantity'],
                     unit_price=detail_data.get('unit_price')
                 )
-        
+                for detail_data in details_data
+            ]
+            TransactionDetail.objects.bulk_create(details)
+            TransactionDetail.apply_stock_delta(details, transaction.transaction_type)
+
+        return transaction
+
+    def update(self, instance, validated_data):
+        details_data = validated_data.pop('details', None)
+        old_type = instance.transaction_type
+
+        with db_transaction.atomic():
+            # Update transaction fields, writing only the columns that
+            # actually came in the payload
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            if validated_data:
+                instance.save(update_fields=list(validated_data))
+
+            # Handle details update if provided
+            if details_data is not None:
+                # Net stock effect per product: reverse the old lines and
+                # apply the new ones, then write one F() update per product
+                # instead of a round-trip per detail row.
+                old_sign = Decimal(1) if old_type in Transaction.INCOMING_TYPES else Decimal(-1)
+                new_sign = (
+                    Decimal(1)
+                    if instance.transaction_type in Transaction.INCOMING_TYPES
+                    else Decimal(-1)
+                )
+
+                deltas = defaultdict(Decimal)
+                for detail in instance.details.all():
+                    deltas[detail.product_id] -= old_sign * detail.quantity
+
+                new_details = [
+                    TransactionDetail(
+                        transaction=instance,
+                        product=detail_data['product'],
+                        quantity=detail_data['quantity'],
+                        unit_price=detail_data.get('unit_price')
+                    )
+                    for detail_data in details_data
+                ]
+                for detail in new_details:
+                    deltas[detail.product_id] += new_sign * detail.quantity
+
+                for product_id, delta in deltas.items():
+                    if delta:
+                        Product.objects.filter(pk=product_id).update(
+                            current_stock=F('current_stock') + delta
+                        )
+
+                # Queryset-level delete and bulk_create skip the per-row
+                # save()/delete() stock hooks; the net deltas above already
+                # cover both the removed and the new rows.
+                instance.details.all().delete()
+                TransactionDetail.objects.bulk_create(new_details, batch_size=500)
+
         return instance
\ No newline at end of file
@@ -1,5 +1,4 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
 from . import views
 from .views import (
     ProductListView,
@@ -12,11 +11,6 @@ from .views import (
     ProductStockMovementsView
 )
 
-# Initialize DefaultRouter for API endpoints
-router = DefaultRouter()
-router.register(r'products', views.ProductViewSet, basename='product')
-router.register(r'transactions', views.TransactionViewSet, basename='transaction')
-
 urlpatterns = [
     
     # Product CRUD URLs
@@ -39,8 +33,9 @@ urlpatterns = [
     
     # Inventory Report
     path('inventory/', inventory_report, name='inventory_report'),
+    path('inventory/export/', views.inventory_report_export, name='inventory_report_export'),
     path('', views.inventory_report, name='inventory_report'),
     
-    # API URLs
-    path('api/', include(router.urls)),
+    # API URLs (single canonical router lives in urls_api)
+    path('api/', include('inventory.urls_api')),
 ]
\ No newline at end of file
@@ -4,8 +4,8 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
-router.register(r'products', views.ProductViewSet)
-router.register(r'transactions', views.StockTransactionViewSet)
+router.register(r'products', views.ProductViewSet, basename='product')
+router.register(r'transactions', views.TransactionViewSet, basename='transaction')
 
 urlpatterns = [
     path('', include(router.urls)),
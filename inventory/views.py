@@ -1,26 +1,140 @@
 # inventory/views.py
+import csv
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection, transaction as db_transaction
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
 from django.urls import reverse_lazy, reverse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.contrib.auth import logout
-from django.db.models import Sum, Case, When, Value, DecimalField, Q
+from django.db.models import (
+    Sum, Case, When, Value, DecimalField, Q, Prefetch,
+    ExpressionWrapper, F, OuterRef, Subquery, Max, Count
+)
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets
-from .models import Product, Transaction
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, ListSerializer
+from .models import Product, Transaction, TransactionDetail
 from .forms import ProductForm, TransactionForm
-from .serializers import ProductSerializer, TransactionSerializer
+from .serializers import ProductSerializer, ProductListSerializer, TransactionSerializer
 
 
 # API Views
-class ProductViewSet(viewsets.ModelViewSet):
+class AutoOptimizeQuerySetMixin:
+    """Derive join optimizations from the serializer's declared fields.
+
+    To-many fields (nested many=True serializers, M2M relations) become
+    prefetch_related lookups and to-one fields (nested serializers, FK
+    traversals like source='product.product_code') become select_related
+    paths, so list endpoints keep a constant query count without each
+    viewset hand-maintaining the lookup lists. Lookups the queryset
+    already prefetches (e.g. with a custom Prefetch) are left alone.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        existing_prefetches = {
+            lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+            for lookup in queryset._prefetch_related_lookups
+        }
+
+        select_paths = set()
+        prefetch_paths = set()
+        for field in self.get_serializer_class()().fields.values():
+            if field.write_only:
+                continue
+            source = (field.source or '').replace('.', '__')
+            if not source or source == '*':
+                continue
+            if isinstance(field, (ListSerializer, ManyRelatedField)):
+                prefetch_paths.add(source)
+            elif isinstance(field, PrimaryKeyRelatedField):
+                # Reads resolve from the local <fk>_id column; a join
+                # would be pure overhead
+                continue
+            elif isinstance(field, (BaseSerializer, RelatedField)):
+                select_paths.add(source)
+            elif '__' in source:
+                select_paths.add(source.rsplit('__', 1)[0])
+
+        if select_paths:
+            queryset = queryset.select_related(*select_paths)
+        prefetch_paths -= existing_prefetches
+        if prefetch_paths:
+            queryset = queryset.prefetch_related(*prefetch_paths)
+        return queryset
+
+class ProductViewSet(AutoOptimizeQuerySetMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all().order_by('product_code')
     serializer_class = ProductSerializer
     filterset_fields = ['product_code', 'product_name']
     search_fields = ['product_code', 'product_name', 'description']
 
-class TransactionViewSet(viewsets.ModelViewSet):
-    queryset = Transaction.objects.all().order_by('-transaction_date')
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ProductListSerializer
+        return ProductSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # description is a TextField the list payload never renders;
+            # skip it (and anything else the slim serializer ignores)
+            queryset = queryset.only(
+                'id', 'product_code', 'product_name',
+                'unit_of_measure', 'unit_price', 'current_stock'
+            )
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        # Build the response from values() dicts: skips per-row model
+        # instantiation and the serializer field walk on the hot list path.
+        # ProductListSerializer still documents the shape for the schema.
+        data = list(self.filter_queryset(self.get_queryset()).values(
+            'id', 'product_code', 'product_name',
+            'unit_of_measure', 'unit_price',
+            available_stock=F('current_stock')
+        ))
+        return Response(data)
+
+class TransactionViewSet(AutoOptimizeQuerySetMixin, viewsets.ModelViewSet):
+    # Line-item total_value is a stored generated column on
+    # TransactionDetail; the transaction total is a subquery summing it,
+    # falling back to the product price for lines saved without one.
+    queryset = Transaction.objects.select_related('created_by').prefetch_related(
+        Prefetch(
+            'details',
+            queryset=TransactionDetail.objects.select_related('product').only(
+                'id', 'quantity', 'unit_price', 'total_value', 'transaction_id',
+                'product__product_code', 'product__product_name',
+                'product__unit_of_measure'
+            )
+        )
+    ).annotate(
+        total_value=Subquery(
+            TransactionDetail.objects.filter(transaction=OuterRef('pk'))
+            .values('transaction')
+            .annotate(
+                total=Sum(
+                    Coalesce(
+                        F('total_value'),
+                        F('quantity') * F('product__unit_price')
+                    ),
+                    output_field=DecimalField(max_digits=12, decimal_places=2)
+                )
+            )
+            .values('total')
+        )
+    ).order_by('-transaction_date')
     serializer_class = TransactionSerializer
     filterset_fields = ['transaction_type', 'created_by']
     search_fields = ['reference_number', 'notes']
@@ -42,31 +156,67 @@ class TransactionListView(LoginRequiredMixin, ListView):
     model = Transaction
     template_name = 'inventory/transaction_list.html'
     context_object_name = 'transactions'
-    ordering = ['-transaction_date']
-    paginate_by = 20
-    
+    # Keyset pagination via ?after=<iso_datetime>&after_id=<pk> cursor
+    # params: one index seek per page regardless of depth, unlike
+    # LIMIT/OFFSET which scans and discards the offset rows.
+    page_size = 20
+
     def get_queryset(self):
         queryset = super().get_queryset()
-        return queryset.select_related('created_by').prefetch_related('products', 'details')
 
+        after = parse_datetime(self.request.GET.get('after') or '')
+        after_id = self.request.GET.get('after_id')
+        if after is not None and after_id and after_id.isdigit():
+            queryset = queryset.filter(
+                Q(transaction_date__lt=after) |
+                Q(transaction_date=after, id__lt=after_id)
+            )
+
+        # 'products' stays prefetched because the template iterates
+        # transaction.products.all directly for the badge column; only()
+        # keeps the SELECT down to the columns the list template renders.
+        # One extra row is fetched to detect whether a next page exists.
+        return queryset.select_related('created_by').prefetch_related(
+            'products',
+            Prefetch('details', queryset=TransactionDetail.objects.select_related('product'))
+        ).only(
+            'id', 'transaction_date', 'transaction_type',
+            'reference_number', 'notes', 'created_by__username'
+        ).order_by('-transaction_date', '-id')[:self.page_size + 1]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        transactions = list(context['object_list'])
+        has_next = len(transactions) > self.page_size
+        transactions = transactions[:self.page_size]
+        context['object_list'] = context['transactions'] = transactions
+        if has_next:
+            cursor = transactions[-1]
+            context['next_after'] = cursor.transaction_date.isoformat()
+            context['next_after_id'] = cursor.id
+        return context
+
+@login_required(login_url='login')
 def transaction_detail(request, transaction_id):
-    if not request.user.is_authenticated:
-        return redirect('login')
-        
+    # to_attr stores the prefetched details as a plain list, so passing
+    # them to the template can never re-invoke the manager and re-query
     transaction = get_object_or_404(
-        Transaction.objects.select_related('created_by')
-                          .prefetch_related('details__product'),
+        Transaction.objects.select_related('created_by').prefetch_related(
+            Prefetch(
+                'details',
+                queryset=TransactionDetail.objects.select_related('product'),
+                to_attr='detail_list'
+            )
+        ),
         id=transaction_id
     )
     return render(request, 'inventory/transaction_detail.html', {
         'transaction': transaction,
-        'details': transaction.details.all()
+        'details': transaction.detail_list
     })
 
+@login_required(login_url='login')
 def inventory_transaction_change(request, pk):
-    if not request.user.is_authenticated:
-        return redirect('login')
-        
     """
     View for changing/updating inventory transactions
     """
@@ -79,14 +229,20 @@ def inventory_transaction_change(request, pk):
     if request.method == 'POST':
         form = TransactionForm(request.POST, instance=transaction)
         if form.is_valid():
-            updated_transaction = form.save(commit=False)
-            updated_transaction.modified_by = request.user
-            updated_transaction.save()
-            form.save_m2m()  # For many-to-many relationships
-            
+            # Idempotent resubmits (e.g. double-clicks) skip the no-op
+            # UPDATE and M2M re-save entirely
+            if not form.has_changed():
+                return redirect('transaction_detail', transaction_id=pk)
+
+            with db_transaction.atomic():
+                updated_transaction = form.save(commit=False)
+                updated_transaction.modified_by = request.user
+                updated_transaction.save()
+                form.save_m2m()  # For many-to-many relationships
+
             # Update related product quantities if needed
             # (Add your specific business logic here)
-            
+
             messages.success(request, 'Transaction updated successfully')
             return redirect('transaction_detail', transaction_id=pk)
     else:
@@ -99,12 +255,14 @@ def inventory_transaction_change(request, pk):
     }
     return render(request, 'inventory/transaction_create.html', context)
 
+@login_required(login_url='login')
 def transaction_delete(request, pk):
-    if not request.user.is_authenticated:
-        return redirect('login')
-        
     """Delete an inventory transaction"""
-    transaction = get_object_or_404(Transaction, pk=pk)
+    # select_related so the ownership check below reads the already
+    # joined row instead of lazy-loading created_by
+    transaction = get_object_or_404(
+        Transaction.objects.select_related('created_by'), pk=pk
+    )
     
     if request.method == 'POST':
         if request.user.is_staff or transaction.created_by == request.user:
@@ -116,43 +274,96 @@ def transaction_delete(request, pk):
     
     return redirect('transaction_list')
 
+@login_required(login_url='login')
 def inventory_report(request):
-    if not request.user.is_authenticated:
-        return redirect('login')
-        
+    # The aggregates below scan every detail row, but the report only
+    # changes when inventory is written. Fingerprint the cache key on
+    # cheap aggregates so any transaction/detail write yields a new key;
+    # the short timeout bounds staleness from direct product edits,
+    # which the fingerprint cannot see.
+    fingerprint = TransactionDetail.objects.aggregate(
+        last_id=Max('id'), total=Count('id')
+    )
+    cache_key = 'inventory_report:{}:{}'.format(
+        fingerprint['last_id'] or 0, fingerprint['total']
+    )
+    cached_context = cache.get(cache_key)
+    if cached_context is not None:
+        return render(request, 'inventory/inventory_report.html', cached_context)
+
+    # Conditional aggregates with filter= let the database skip
+    # non-matching detail rows instead of evaluating a CASE per row
     products = Product.objects.annotate(
         total_in=Sum(
-            Case(
-                When(transaction_details__transaction__transaction_type__in=['purchase', 'return', 'adjustment'],
-                     then='transaction_details__quantity'),
-                default=Value(0),
-                output_field=DecimalField()
-            )
+            'transaction_details__quantity',
+            filter=Q(transaction_details__transaction__transaction_type__in=Transaction.INCOMING_TYPES),
+            output_field=DecimalField()
         ),
         total_out=Sum(
-            Case(
-                When(transaction_details__transaction__transaction_type__in=['sale'],
-                     then='transaction_details__quantity'),
-                default=Value(0),
-                output_field=DecimalField()
-            )
+            'transaction_details__quantity',
+            filter=Q(transaction_details__transaction__transaction_type__in=Transaction.OUTGOING_TYPES),
+            output_field=DecimalField()
         )
+    ).values(
+        # Plain dicts skip per-row model instantiation; the template
+        # reads the same keys either way
+        'pk', 'product_code', 'product_name', 'unit_of_measure',
+        'current_stock', 'total_in', 'total_out'
     ).order_by('product_code')
     
-    try:
-        total_value = sum(
-            float(p.current_stock) * float(p.unit_price or 0)
-            for p in products
+    # Single scalar aggregate in the database instead of materializing
+    # every product and multiplying in Python
+    total_value = Product.objects.aggregate(
+        total=Sum(
+            ExpressionWrapper(
+                F('current_stock') * Coalesce(F('unit_price'), Value(0)),
+                output_field=DecimalField(max_digits=14, decimal_places=2)
+            )
         )
-    except (TypeError, ValueError):
-        total_value = 0
-    
+    )['total'] or 0
+
+
+    # iterator() streams the annotated rows in chunks, so building the
+    # (cached) list never holds the driver's full result set on top of
+    # the materialized rows
     context = {
-        'products': products,
+        'products': list(products.iterator(chunk_size=2000)),
         'total_value': total_value
     }
+    cache.set(cache_key, context, 600)
     return render(request, 'inventory/inventory_report.html', context)
 
+class _EchoBuffer:
+    """Pseudo file object whose write() returns the row for streaming"""
+    def write(self, value):
+        return value
+
+@login_required(login_url='login')
+def inventory_report_export(request):
+    def rows():
+        writer = csv.writer(_EchoBuffer())
+        yield writer.writerow([
+            'Product Code', 'Product Name', 'UOM', 'Current Stock', 'Unit Price'
+        ])
+        products = Product.objects.only(
+            'product_code', 'product_name', 'unit_of_measure',
+            'current_stock', 'unit_price'
+        ).order_by('product_code')
+        # iterator() keeps memory flat for large catalogs instead of
+        # materializing the whole queryset before the first byte is sent
+        for product in products.iterator(chunk_size=1000):
+            yield writer.writerow([
+                product.product_code,
+                product.product_name,
+                product.unit_of_measure,
+                product.current_stock,
+                product.unit_price,
+            ])
+
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="inventory_report.csv"'
+    return response
+
 class ProductListView(LoginRequiredMixin, ListView):
     model = Product
     template_name = 'inventory/product_list.html'
@@ -161,13 +372,28 @@ class ProductListView(LoginRequiredMixin, ListView):
     ordering = ['product_code']
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # description stays in the projection because the list template
+        # renders a truncated version of it
+        queryset = super().get_queryset().only(
+            'id', 'product_code', 'product_name', 'description',
+            'unit_of_measure', 'current_stock'
+        )
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(product_code__icontains=search_query) |
-                Q(product_name__icontains=search_query)
-            )
+            if connection.vendor == 'postgresql':
+                # Trigram similarity rides the pg_trgm GIN index; the
+                # leading-wildcard LIKE below can only sequential-scan
+                queryset = queryset.annotate(
+                    similarity=(
+                        TrigramSimilarity('product_code', search_query)
+                        + TrigramSimilarity('product_name', search_query)
+                    )
+                ).filter(similarity__gt=0.15).order_by('-similarity')
+            else:
+                queryset = queryset.filter(
+                    Q(product_code__icontains=search_query) |
+                    Q(product_name__icontains=search_query)
+                )
         return queryset
 
 class ProductCreateView(LoginRequiredMixin, CreateView):
@@ -196,14 +422,27 @@ class ProductDeleteView(LoginRequiredMixin, DeleteView):
     model = Product
     template_name = 'inventory/product_confirm_delete.html'
     success_url = reverse_lazy('product_list')
+
+    def get_queryset(self):
+        # The confirm page renders str(object) and the guard reads the
+        # stock, so fetch just those columns instead of the whole row
+        return Product.objects.only(
+            'id', 'product_code', 'product_name', 'current_stock'
+        )
     
-    def delete(self, request, *args, **kwargs):
-        product = self.get_object()
-        if product.current_stock != 0:
-            messages.error(request, "Cannot delete product with existing stock")
-            return self.get(request, *args, **kwargs)
-        messages.success(request, f"Product {product.product_code} deleted")
-        return super().delete(request, *args, **kwargs)
+    def form_valid(self, form):
+        # Guard and delete in a single conditional query; a separate
+        # Python-side stock check would race with concurrent transactions
+        # between the read and the delete. (DeleteView routes POSTs
+        # through form_valid, not the old delete() hook.)
+        deleted, _ = Product.objects.filter(
+            pk=self.object.pk, current_stock=0
+        ).delete()
+        if deleted == 0:
+            messages.error(self.request, "Cannot delete product with existing stock")
+            return self.render_to_response(self.get_context_data(form=form))
+        messages.success(self.request, f"Product {self.object.product_code} deleted")
+        return redirect(self.success_url)
 
 class ProductStockMovementsView(LoginRequiredMixin, DetailView):
     model = Product
@@ -214,32 +453,35 @@ class ProductStockMovementsView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         product = self.get_object()
         
-        # Get all transaction details for this product
-        details = product.transaction_details.select_related(
-            'transaction', 'transaction__created_by'
+        # Get all transaction details for this product. Prefetching the
+        # transaction (with its user) materializes each distinct
+        # transaction once, instead of the select_related join repeating
+        # the transaction+user columns on every detail row.
+        details = product.transaction_details.prefetch_related(
+            Prefetch(
+                'transaction',
+                queryset=Transaction.objects.select_related('created_by')
+            )
         ).order_by('-transaction__transaction_date')
         
-        # Calculate totals using aggregation
+        # Calculate totals using filtered aggregation
         totals = details.aggregate(
             total_in=Sum(
-                Case(
-                    When(transaction__transaction_type__in=['purchase', 'return', 'adjustment'],
-                         then='quantity'),
-                    default=Value(0),
-                    output_field=DecimalField()
-                )
+                'quantity',
+                filter=Q(transaction__transaction_type__in=Transaction.INCOMING_TYPES),
+                output_field=DecimalField()
             ),
             total_out=Sum(
-                Case(
-                    When(transaction__transaction_type='sale',
-                         then='quantity'),
-                    default=Value(0),
-                    output_field=DecimalField()
-                )
+                'quantity',
+                filter=Q(transaction__transaction_type__in=Transaction.OUTGOING_TYPES),
+                output_field=DecimalField()
             )
         )
         
-        context['movements'] = details
+        # Totals aggregate over the whole history in the database; the
+        # template only ever needs one page of rows
+        paginator = Paginator(details, 50)
+        context['movements'] = paginator.get_page(self.request.GET.get('page'))
         context['total_in'] = totals['total_in'] or 0
         context['total_out'] = totals['total_out'] or 0
         
@@ -86,6 +86,10 @@ DATABASES = {
     }
 }
 
+# Cache session rows so authenticated requests skip the per-request
+# session SELECT (writes still hit the database)
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'inventory_report'
 LOGOUT_REDIRECT_URL = 'login'